@@ -4,7 +4,7 @@ Centralized application state with simple subscription hooks.
 This is intentionally lightweight (no Qt signals) and safe to call from worker threads.
 UI subscribers that need to update tkinter widgets should schedule via `root.after(...)`.
 """
-from typing import Dict, Callable, List, Optional
+from typing import Dict, Callable, Iterable, List, Optional, Tuple
 from dataclasses import dataclass, field
 import threading
 
@@ -21,40 +21,91 @@ class TrackInfo:
 
 class AppState:
     def __init__(self):
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()  # callbacks always run after release; no re-entry
         self.playlists: List[Dict] = []
         self.tracks: Dict[str, TrackInfo] = {}
-        self.queue: List[str] = []
+        self.queue: Dict[str, None] = {}  # insertion-ordered set of track ids
         self.loading: bool = False
 
-        # subscribers
-        self._on_playlists: List[Callable[[], None]] = []
-        self._on_tracks: List[Callable[[], None]] = []
-        self._on_queue: List[Callable[[], None]] = []
-        self._on_track_updated: List[Callable[[str], None]] = []
+        # subscribers: copy-on-write tuples, so firing iterates without copying
+        self._on_playlists: Tuple[Callable[[], None], ...] = ()
+        self._on_tracks: Tuple[Callable[[], None], ...] = ()
+        self._on_queue: Tuple[Callable[[], None], ...] = ()
+        self._on_track_updated: Tuple[Callable[[str], None], ...] = ()
+
+        # coalesced full-list refresh (see schedule_tracks_flush)
+        self._tracks_dirty = False
+        self._tracks_flush_scheduled = False
+        self._flush_root = None
+        self._flush_interval_ms = 50
 
     # Subscription API
     def subscribe_playlists(self, cb: Callable[[], None]):
         with self._lock:
-            self._on_playlists.append(cb)
+            self._on_playlists = self._on_playlists + (cb,)
 
     def subscribe_tracks(self, cb: Callable[[], None]):
         with self._lock:
-            self._on_tracks.append(cb)
+            self._on_tracks = self._on_tracks + (cb,)
 
     def subscribe_queue(self, cb: Callable[[], None]):
         with self._lock:
-            self._on_queue.append(cb)
+            self._on_queue = self._on_queue + (cb,)
 
     def subscribe_track_updated(self, cb: Callable[[str], None]):
         with self._lock:
-            self._on_track_updated.append(cb)
+            self._on_track_updated = self._on_track_updated + (cb,)
+
+    def schedule_tracks_flush(self, root, interval_ms: int = 50):
+        """
+        Coalesce `_on_tracks` notifications caused by per-track updates.
+        Once scheduled, status changes only mark the list dirty and the subscribers
+        are fired at most once every `interval_ms` on `root`'s event loop; progress-only
+        updates never touch the list (the row is refreshed via `_on_track_updated`).
+        Call once from the UI thread at startup.
+        """
+        with self._lock:
+            if self._tracks_flush_scheduled:
+                return
+            self._tracks_flush_scheduled = True
+            self._flush_root = root
+            self._flush_interval_ms = interval_ms
+        root.after(interval_ms, self._flush_tracks)
+
+    def _flush_tracks(self):
+        with self._lock:
+            dirty = self._tracks_dirty
+            self._tracks_dirty = False
+        if dirty:
+            for cb in self._on_tracks:
+                try:
+                    cb()
+                except Exception:
+                    pass
+        try:
+            self._flush_root.after(self._flush_interval_ms, self._flush_tracks)
+        except Exception:
+            # root destroyed; fall back to immediate notifications
+            with self._lock:
+                self._tracks_flush_scheduled = False
+
+    def _tracks_changed(self):
+        """Mark the track list dirty, or notify immediately when no flush timer runs."""
+        with self._lock:
+            if self._tracks_flush_scheduled:
+                self._tracks_dirty = True
+                return
+        for cb in self._on_tracks:
+            try:
+                cb()
+            except Exception:
+                pass
 
     # Mutators
     def set_playlists(self, playlists: List[Dict]):
         with self._lock:
             self.playlists = playlists
-        for cb in list(self._on_playlists):
+        for cb in self._on_playlists:
             try:
                 cb()
             except Exception:
@@ -63,7 +114,7 @@ class AppState:
     def set_tracks(self, tracks: Dict[str, TrackInfo]):
         with self._lock:
             self.tracks = tracks
-        for cb in list(self._on_tracks):
+        for cb in self._on_tracks:
             try:
                 cb()
             except Exception:
@@ -72,7 +123,7 @@ class AppState:
     def add_track(self, t: TrackInfo):
         with self._lock:
             self.tracks[t.id] = t
-        for cb in list(self._on_tracks):
+        for cb in self._on_tracks:
             try:
                 cb()
             except Exception:
@@ -83,6 +134,8 @@ class AppState:
             t = self.tracks.get(track_id)
             if not t:
                 return
+            # progress ticks only touch the row (via _on_track_updated), not the whole list
+            status_changed = status is not None and status != t.status
             if status is not None:
                 t.status = status
             if progress is not None:
@@ -91,25 +144,47 @@ class AppState:
                 t.path = path
             if error is not None:
                 t.error = error
-        for cb in list(self._on_track_updated):
+        for cb in self._on_track_updated:
             try:
                 cb(track_id)
             except Exception:
                 pass
-        for cb in list(self._on_tracks):
-            try:
-                cb()
-            except Exception:
-                pass
+        if status_changed:
+            self._tracks_changed()
+
+    def bulk_update_status(self, track_ids: Iterable[str], status: str, error: Optional[str] = None):
+        """Set `status` (and `error`) on many tracks under one lock; the track list is notified once."""
+        with self._lock:
+            updated = []
+            status_changed = False
+            for tid in track_ids:
+                t = self.tracks.get(tid)
+                if not t:
+                    continue
+                status_changed = status_changed or t.status != status
+                t.status = status
+                if error is not None:
+                    t.error = error
+                updated.append(tid)
+        if not updated:
+            return
+        for tid in updated:
+            for cb in self._on_track_updated:
+                try:
+                    cb(tid)
+                except Exception:
+                    pass
+        if status_changed:
+            self._tracks_changed()
 
     def enqueue(self, track_id: str):
         with self._lock:
             if track_id not in self.queue:
-                self.queue.append(track_id)
+                self.queue[track_id] = None
                 # set queued status if track exists
                 if track_id in self.tracks:
                     self.tracks[track_id].status = "queued"
-        for cb in list(self._on_queue):
+        for cb in self._on_queue:
             try:
                 cb()
             except Exception:
@@ -117,9 +192,8 @@ class AppState:
 
     def dequeue(self, track_id: str):
         with self._lock:
-            if track_id in self.queue:
-                self.queue.remove(track_id)
-        for cb in list(self._on_queue):
+            self.queue.pop(track_id, None)
+        for cb in self._on_queue:
             try:
                 cb()
             except Exception:
@@ -127,8 +201,8 @@ class AppState:
 
     def clear_queue(self):
         with self._lock:
-            self.queue = []
-        for cb in list(self._on_queue):
+            self.queue.clear()
+        for cb in self._on_queue:
             try:
                 cb()
             except Exception:
@@ -5,12 +5,16 @@ DownloadController: separates download orchestration from UI.
 - Runs a small listener thread that translates downloader events into AppState updates.
 - Exposes safe APIs: enqueue(track_task), enqueue_batch, cancel_all.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import threading
 import queue
 import time
 
-from .downloader import Downloader
+from .downloader import (
+    Downloader, task_track_id, EVENT_NAMES,
+    EV_PROGRESS, EV_COMPLETED, EV_FAILED, EV_DOWNLOAD_ERROR,
+    EV_VIDEO_UNAVAILABLE, EV_PRIVATE_VIDEO, EV_FFMPEG_MISSING, EV_TAG_FAILED,
+)
 from .app_state import AppState
 from .modal_manager import ModalManager
 
@@ -21,90 +25,107 @@ class DownloadController:
         self.modal = modal
 
         # downloader posts events into this queue; Downloader expects an event_queue arg
-        self._event_queue: "queue.Queue[Dict]" = queue.Queue()
+        self._event_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
         self._downloader = Downloader(self.cfg, self._event_queue)
-        self._listener = threading.Thread(target=self._listen, daemon=True)
         self._stop = threading.Event()
-        self._listener.start()
         self._current_progress_key = None
+        # last integer percentage applied per track; repeats are dropped
+        self._last_pct: Dict[str, int] = {}
+        self._handlers = {
+            EV_PROGRESS: self._on_progress,
+            EV_COMPLETED: self._on_completed,
+            EV_TAG_FAILED: self._on_tag_failed,
+            EV_FAILED: self._on_failed,
+            EV_DOWNLOAD_ERROR: self._on_failed,
+            EV_VIDEO_UNAVAILABLE: self._on_failed,
+            EV_PRIVATE_VIDEO: self._on_failed,
+            EV_FFMPEG_MISSING: self._on_failed,
+        }
+        # start listening only once everything _handle_event touches exists
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
 
     def _listen(self):
-        while not self._stop.is_set():
-            try:
-                ev = self._event_queue.get(timeout=0.5)
-            except Exception:
-                continue
+        # blocks until an event arrives; a None sentinel (from cancel_all) ends the thread
+        while True:
+            ev = self._event_queue.get()
+            if ev is None:
+                break
             try:
                 self._handle_event(ev)
             except Exception:
                 # swallow to keep listener running
                 pass
-            finally:
-                try:
-                    self._event_queue.task_done()
-                except Exception:
-                    pass
-
-    def _handle_event(self, ev: Dict):
-        ttype = ev.get("type")
-        idx = ev.get("idx")
-        meta = ev.get("meta", {})
-        track_id = str(meta.get("id") or idx or meta.get("uri") or meta.get("track_id") or f"track-{idx}")
 
-        if ttype == "progress":
-            perc = ev.get("progress", 0.0)
-            self.state.update_track_status(track_id, status="downloading", progress=perc)
-            # update modal if present
-            if self._current_progress_key:
-                self.modal.update(self._current_progress_key, value=int(perc * 100))
-        elif ttype in ("completed",):
-            path = ev.get("path")
-            self.state.update_track_status(track_id, status="completed", progress=1.0, path=path)
-            self.state.dequeue(track_id)
-        elif ttype in ("download_error", "failed", "video_unavailable", "private_video", "ffmpeg_missing"):
-            err = ev.get("error") or ev.get("reason") or ttype
-            self.state.update_track_status(track_id, status="failed", error=err)
-            self.state.dequeue(track_id)
+    def _handle_event(self, ev: Tuple[int, str, Any]):
+        code, track_id, value = ev
+        handler = self._handlers.get(code)
+        if handler:
+            handler(code, track_id, value)
         # add other mapping rules as needed
 
+    def _on_progress(self, code: int, track_id: str, perc: float):
+        pct = int(perc * 100)
+        if self._last_pct.get(track_id) == pct:
+            return
+        self._last_pct[track_id] = pct
+        self.state.update_track_status(track_id, status="downloading", progress=perc)
+        # update modal if present
+        if self._current_progress_key:
+            self.modal.update(self._current_progress_key, value=pct)
+
+    def _on_completed(self, code: int, track_id: str, info: Dict):
+        self._last_pct.pop(track_id, None)
+        self.state.update_track_status(track_id, status="completed", progress=1.0, path=info.get("path"))
+        self.state.dequeue(track_id)
+
+    def _on_tag_failed(self, code: int, track_id: str, info: Dict):
+        # file is downloaded; keep it completed but surface the tagging error
+        self.state.update_track_status(track_id, error=info.get("error") or EVENT_NAMES[code])
+
+    def _on_failed(self, code: int, track_id: str, info: Dict):
+        err = info.get("error") or info.get("reason") or EVENT_NAMES[code]
+        self._last_pct.pop(track_id, None)
+        self.state.update_track_status(track_id, status="failed", error=err)
+        self.state.dequeue(track_id)
+
     def enqueue(self, task: Dict):
         """
         Task should be the dict Downloader expects (idx, meta, total).
         Also attempts to set track status to queued via AppState when possible.
         """
-        meta = task.get("meta", {})
-        track_id = str(meta.get("id") or task.get("idx"))
-        self.state.enqueue(track_id)
+        self.state.enqueue(task_track_id(task))
         self._downloader.enqueue(task)
 
     def enqueue_batch(self, tasks: List[Dict]):
         for t in tasks:
             self.enqueue(t)
 
+    def reload_config(self):
+        """Propagate saved settings to the download workers."""
+        self._downloader.reload_config()
+
     def cancel_all(self):
         """
         Attempt to stop workers and clear queues.
         Note: ongoing yt-dlp calls may not abort immediately; this attempts a clean stop.
         """
+        if self._stop.is_set():
+            return
         # stop listeners
         self._stop.set()
-        try:
-            # set downloader internal stop flag (best-effort)
-            self._downloader._stop.set()
-        except Exception:
-            pass
-        # flush pending tasks in downloader.task_queue
-        try:
-            while True:
+        self._event_queue.put(None)
+        # keep workers from taking more tasks, flush the pending ones, then wake them so they exit
+        self._downloader._stop.set()
+        while True:
+            try:
                 self._downloader.task_queue.get_nowait()
-                self._downloader.task_queue.task_done()
-        except Exception:
-            pass
+            except queue.Empty:
+                break
+        self._downloader.stop(join=False)
         # mark queued tracks as idle/failed
-        with threading.RLock():
-            for tid in list(self.state.queue):
-                self.state.update_track_status(tid, status="failed", error="cancelled")
-            self.state.clear_queue()
+        self.state.bulk_update_status(list(self.state.queue), "failed", "cancelled")
+        self.state.clear_queue()
 
     def shutdown(self):
         self.cancel_all()
\ No newline at end of file
@@ -1,27 +1,90 @@
 """
 Downloader: yt-dlp worker queue and helpers.
-Sends events to an event_queue (dict messages) about completed/failed downloads.
+Sends events to an event_queue about progress and completed/failed downloads.
 
 Downloader manages a thread pool consuming tasks placed on its internal queue.
 Each task is a dict with keys: idx, meta, total.
-Sends events (dict) to event_queue with type: completed, download_error, video_unavailable, private_video, ffmpeg_missing, failed
+Events are tuples (code, track_id, value) with code one of the EV_* constants below:
+- EV_PROGRESS: value is the fraction downloaded (posted only when the integer percentage grows)
+- every other code is terminal: value is a dict with idx, total, meta and path/error where relevant
+Tagging runs on a separate small pool after EV_COMPLETED is posted; tagging failures arrive later as EV_TAG_FAILED.
 """
 from __future__ import annotations
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional, Set
 from pathlib import Path
-import threading
+import concurrent.futures
+import os
 import queue
+import re
+import threading
 import yt_dlp
+from yt_dlp.cookies import YoutubeDLCookieJar
 from .utils import logger, sanitize_filename, ensure_dir
-from .tagging import tag_mp3_file
+from .tagging import tag_mp3_file, prefetch_album_art
+
+EV_PROGRESS = 0
+EV_COMPLETED = 1
+EV_FAILED = 2
+EV_DOWNLOAD_ERROR = 3
+EV_VIDEO_UNAVAILABLE = 4
+EV_PRIVATE_VIDEO = 5
+EV_FFMPEG_MISSING = 6
+EV_TAG_FAILED = 7
+
+# event names as used for history / log messages
+EVENT_NAMES = {
+    EV_PROGRESS: "progress",
+    EV_COMPLETED: "completed",
+    EV_FAILED: "failed",
+    EV_DOWNLOAD_ERROR: "download_error",
+    EV_VIDEO_UNAVAILABLE: "video_unavailable",
+    EV_PRIVATE_VIDEO: "private_video",
+    EV_FFMPEG_MISSING: "ffmpeg_missing",
+    EV_TAG_FAILED: "tag_failed",
+}
+
+# yt-dlp / postprocessing failure classifiers, precompiled and case-insensitive;
+# checked one category at a time so a message matching several keeps the old priority
+_ERR_UNAVAILABLE = re.compile(r"unavailable|not available", re.IGNORECASE)
+_ERR_PRIVATE = re.compile(r"private|deleted", re.IGNORECASE)
+_ERR_FFMPEG = re.compile(r"ffmpeg", re.IGNORECASE)
+
+def task_track_id(task: Dict) -> str:
+    """Track id used in events and AppState for a downloader task."""
+    return str(task.get("meta", {}).get("id") or task.get("idx"))
+
+# outtmpl of an idle worker YoutubeDL; replaced with the track path for each task
+_OUTTMPL_PLACEHOLDER = "%(title)s.%(ext)s"
+
+class _FrozenCfg(NamedTuple):
+    """Snapshot of the download settings read on every task (rebuilt by reload_config)."""
+    output_dir: Path
+    organize_by_artist: bool
+    audio_quality: str
+    skip_existing: bool
+    add_metadata: bool
 
 class Downloader:
-    def __init__(self, cfg: Dict, event_queue: "queue.Queue[Dict]"):
+    def __init__(self, cfg: Dict, event_queue: "queue.SimpleQueue"):
         self.cfg = cfg
         self.event_queue = event_queue
-        self.task_queue: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        # unbounded and C-implemented: enqueue never blocks the Tk thread
+        self.task_queue: "queue.SimpleQueue[Optional[Dict]]" = queue.SimpleQueue()
         self.workers = []
         self._stop = threading.Event()
+        self._frozen_cfg = self._freeze_cfg()
+        # output directory listings, read once per directory for skip_existing checks
+        self._dir_cache: Dict[Path, Set[str]] = {}
+        self._dir_cache_lock = threading.Lock()
+        # one cookie jar for all workers, so consent/session cookies are set once
+        self._cookiejar = YoutubeDLCookieJar()
+        # per-worker state read by the yt-dlp progress hook (runs on the worker thread)
+        self._tls = threading.local()
+        # tagging (album art HTTP + mutagen I/O) must not hold up the next yt-dlp search
+        self._tag_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="tag")
+        # album art is fetched while its track downloads; at most one cover per worker in flight
+        self._art_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(cfg.get("concurrency", 3))), thread_name_prefix="art")
         self._start_workers()
 
     def _start_workers(self):
@@ -34,26 +97,106 @@ class Downloader:
     def enqueue(self, task: Dict):
         self.task_queue.put(task)
 
+    def reload_config(self):
+        """Re-freeze cfg for the workers' next tasks (call after saving settings)."""
+        with self._dir_cache_lock:
+            self._dir_cache.clear()
+        self._frozen_cfg = self._freeze_cfg()
+
+    def _dir_listing(self, path: Path) -> Set[str]:
+        """
+        Return the (cached) set of file names in `path`, creating the directory on first use.
+        The set is updated in place as downloads land in it. It can go stale if files are
+        removed behind our back, so callers confirm a hit on disk before trusting it.
+        """
+        with self._dir_cache_lock:
+            entries = self._dir_cache.get(path)
+            if entries is None:
+                ensure_dir(path)
+                try:
+                    entries = set(os.listdir(path))
+                except OSError:
+                    entries = set()
+                self._dir_cache[path] = entries
+            return entries
+
+    def _freeze_cfg(self) -> _FrozenCfg:
+        return _FrozenCfg(
+            output_dir=Path(self.cfg["output_dir"]),
+            organize_by_artist=bool(self.cfg.get("organize_by_artist")),
+            audio_quality=str(self.cfg.get("audio_quality", "320")),
+            skip_existing=bool(self.cfg.get("skip_existing", True)),
+            add_metadata=bool(self.cfg.get("add_metadata", True)),
+        )
+
+    def _build_ydl(self, audio_quality: str) -> "yt_dlp.YoutubeDL":
+        """Create the long-lived YoutubeDL for one worker; outtmpl is set per task."""
+        opts = {
+            "format": f"bestaudio[abr<={audio_quality}]/bestaudio",
+            "outtmpl": {"default": _OUTTMPL_PLACEHOLDER},
+            "postprocessors": [{
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": audio_quality
+            }],
+            "quiet": True,
+            "no_warnings": True,
+            "noplaylist": True,
+            "retries": int(self.cfg.get("ytdlp_retries", 10)),
+            "progress_hooks": [self._progress_hook],
+        }
+        ydl = yt_dlp.YoutubeDL(opts)
+        # must be swapped before the first request builds ydl's request handlers
+        ydl.cookiejar = self._cookiejar
+        return ydl
+
+    def _progress_hook(self, d: Dict):
+        if d.get("status") != "downloading":
+            return
+        total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate")
+        if not total_bytes:
+            return
+        ctx = self._tls
+        pct = int(d.get("downloaded_bytes", 0) * 100 / total_bytes)
+        if pct <= ctx.last_pct:
+            return
+        ctx.last_pct = pct
+        self.event_queue.put((EV_PROGRESS, ctx.track_id, min(pct, 100) / 100.0))
+
     def _worker(self):
-        while not self._stop.is_set():
-            try:
-                task = self.task_queue.get(timeout=0.5)
-            except Exception:
-                continue
-            if task is None:
-                break
-            try:
-                self._do_task(task)
-            except Exception as e:
-                logger.exception("Unhandled error in download task: %s", e)
-                self.event_queue.put({"type": "failed", "meta": task.get("meta", {}), "error": str(e)})
-            finally:
-                self.task_queue.task_done()
+        # one YoutubeDL per worker; the format selector and postprocessors are
+        # built at construction, so it is only rebuilt when the quality changes
+        ydl = None
+        ydl_quality = None
+        try:
+            while not self._stop.is_set():
+                # block until work arrives; stop() wakes idle workers with a None each
+                task = self.task_queue.get()
+                if task is None:
+                    break
+                try:
+                    opts = self._frozen_cfg
+                    if ydl is None or opts.audio_quality != ydl_quality:
+                        if ydl is not None:
+                            ydl.close()
+                        ydl = self._build_ydl(opts.audio_quality)
+                        ydl_quality = opts.audio_quality
+                    self._do_task(task, ydl, opts)
+                except Exception as e:
+                    logger.exception("Unhandled error in download task: %s", e)
+                    self.event_queue.put((EV_FAILED, task_track_id(task), {"meta": task.get("meta", {}), "error": str(e)}))
+        finally:
+            if ydl is not None:
+                try:
+                    ydl.close()
+                except Exception:
+                    pass
 
-    def _do_task(self, task: Dict):
+    def _do_task(self, task: Dict, ydl: "yt_dlp.YoutubeDL", opts: _FrozenCfg):
         idx = task.get("idx")
         meta = task.get("meta", {})
         total = task.get("total", 0)
+        track_id = task_track_id(task)
 
         artist = ", ".join(meta.get("artists", []))
         title = meta.get("title", "")
@@ -61,73 +204,106 @@ class Downloader:
         album_art_url = meta.get("album_art_url")
         year = meta.get("year")
 
-        out_dir = Path(self.cfg.get("output_dir"))
-        if self.cfg.get("organize_by_artist") and artist:
+        out_dir = opts.output_dir
+        if opts.organize_by_artist and artist:
             out_dir = out_dir / sanitize_filename(artist)
-        if self.cfg.get("organize_by_artist") and album:
+        if opts.organize_by_artist and album:
             out_dir = out_dir / sanitize_filename(album)
-        ensure_dir(out_dir)
 
         safe_name = sanitize_filename(f"{artist} - {title}")
-        mp3_path = out_dir / f"{safe_name}.mp3"
+        mp3_name = f"{safe_name}.mp3"
+        mp3_path = out_dir / mp3_name
+        entries = self._dir_listing(out_dir)
 
-        if mp3_path.exists() and self.cfg.get("skip_existing", True):
-            logger.info("Skipping existing: %s", mp3_path)
-            self.event_queue.put({"type": "completed", "idx": idx, "total": total, "meta": meta, "path": str(mp3_path)})
-            return True
+        if opts.skip_existing and mp3_name in entries:
+            # one stat, only for tracks that look downloaded already
+            if mp3_path.exists():
+                logger.info("Skipping existing: %s", mp3_path)
+                self.event_queue.put((EV_COMPLETED, track_id, {"idx": idx, "total": total, "meta": meta, "path": str(mp3_path)}))
+                return True
+            # deleted or moved since it was listed; download it again
+            with self._dir_cache_lock:
+                entries.discard(mp3_name)
+
+        if opts.add_metadata:
+            # fetch the cover while yt-dlp searches and downloads; prefetching at
+            # pickup keeps the window to one cover per worker, so it stays cached until tagging
+            try:
+                prefetch_album_art(album_art_url, self._art_pool)
+            except RuntimeError:
+                pass  # pool shut down by stop(); tagging fetches the art directly
 
         query = f"{artist} {title} official audio"
 
-        ytdlp_opts = {
-            "format": f"bestaudio[abr<={self.cfg.get('audio_quality', '320')}]/bestaudio",
-            "outtmpl": str(out_dir / (safe_name + ".%(ext)s")),
-            "postprocessors": [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": self.cfg.get("audio_quality", "320")
-            }],
-            "quiet": True,
-            "no_warnings": True,
-            "noplaylist": True,
-        }
+        ctx = self._tls
+        ctx.track_id, ctx.last_pct = track_id, -1
 
         # run download
         try:
-            with yt_dlp.YoutubeDL(ytdlp_opts) as ydl:
+            ydl.params["outtmpl"] = {"default": str(out_dir / (safe_name + ".%(ext)s"))}
+            try:
                 ydl.extract_info(f"ytsearch1:{query}", download=True)
+            finally:
+                ydl.params["outtmpl"] = {"default": _OUTTMPL_PLACEHOLDER}
 
-            # locate mp3
-            candidates = list(out_dir.glob(f"{safe_name}.*"))
-            mp3_candidates = [p for p in candidates if p.suffix.lower() == ".mp3"]
-            mp3_path_final = mp3_candidates[0] if mp3_candidates else (out_dir / f"{safe_name}.mp3")
-
-            if mp3_path_final.exists() and self.cfg.get("add_metadata", True):
-                tag_mp3_file(mp3_path_final, meta, album_art_url)
+            # locate mp3: the postprocessor forces .mp3, so probe that first and
+            # only scan the directory when the expected file is missing
+            mp3_path_final = mp3_path
+            if not mp3_path_final.exists():
+                candidates = list(out_dir.glob(f"{safe_name}.*"))
+                mp3_path_final = next((p for p in candidates if p.suffix.lower() == ".mp3"), mp3_path_final)
 
-            self.event_queue.put({"type": "completed", "idx": idx, "total": total, "meta": meta, "path": str(mp3_path_final)})
-            return True
+            landed = mp3_path_final.exists()
+            if landed:
+                with self._dir_cache_lock:
+                    entries.add(mp3_path_final.name)
 
         except yt_dlp.utils.DownloadError as e:
-            error_msg = str(e).lower()
-            if 'unavailable' in error_msg or 'not available' in error_msg:
-                self.event_queue.put({"type": "video_unavailable", "idx": idx, "total": total, "meta": meta})
-            elif 'private' in error_msg or 'deleted' in error_msg:
-                self.event_queue.put({"type": "private_video", "idx": idx, "total": total, "meta": meta})
+            error_msg = str(e)
+            if _ERR_UNAVAILABLE.search(error_msg):
+                self.event_queue.put((EV_VIDEO_UNAVAILABLE, track_id, {"idx": idx, "total": total, "meta": meta}))
+            elif _ERR_PRIVATE.search(error_msg):
+                self.event_queue.put((EV_PRIVATE_VIDEO, track_id, {"idx": idx, "total": total, "meta": meta}))
             else:
-                self.event_queue.put({"type": "download_error", "idx": idx, "total": total, "meta": meta, "error": str(e)})
+                self.event_queue.put((EV_DOWNLOAD_ERROR, track_id, {"idx": idx, "total": total, "meta": meta, "error": error_msg}))
             return False
         except Exception as e:
-            error_msg = str(e).lower()
-            if 'ffmpeg' in error_msg:
-                self.event_queue.put({"type": "ffmpeg_missing", "idx": idx, "total": total, "meta": meta, "error": error_msg})
+            error_msg = str(e)
+            if _ERR_FFMPEG.search(error_msg):
+                self.event_queue.put((EV_FFMPEG_MISSING, track_id, {"idx": idx, "total": total, "meta": meta, "error": error_msg}))
             else:
-                self.event_queue.put({"type": "failed", "idx": idx, "total": total, "meta": meta, "error": str(e)})
+                self.event_queue.put((EV_FAILED, track_id, {"idx": idx, "total": total, "meta": meta, "error": error_msg}))
             return False
 
-    def stop(self):
+        # the download itself succeeded; tagging problems never turn it into a failure
+        if landed and opts.add_metadata:
+            try:
+                self._tag_pool.submit(self._tag_track, mp3_path_final, meta, album_art_url, track_id)
+            except RuntimeError:
+                # pool already shut down by stop(); tag this last file on the worker
+                self._tag_track(mp3_path_final, meta, album_art_url, track_id)
+
+        self.event_queue.put((EV_COMPLETED, track_id, {"idx": idx, "total": total, "meta": meta, "path": str(mp3_path_final)}))
+        return True
+
+    def _tag_track(self, path: Path, meta: Dict, album_art_url: Optional[str], track_id: str):
+        # runs on the tagging pool
+        try:
+            ok = tag_mp3_file(path, meta, album_art_url)
+            error = "tagging failed"
+        except Exception as e:
+            ok, error = False, str(e)
+        if not ok:
+            self.event_queue.put((EV_TAG_FAILED, track_id, {"meta": meta, "path": str(path), "error": error}))
+
+    def stop(self, join: bool = True):
+        # workers close their YoutubeDL instances on the way out
         self._stop.set()
-        # drain queue by putting None per worker
+        # wake every blocked worker with a None sentinel
         for _ in self.workers:
             self.task_queue.put(None)
-        for w in self.workers:
-            w.join(timeout=1)
\ No newline at end of file
+        if join:
+            for w in self.workers:
+                w.join(timeout=1)
+        self._tag_pool.shutdown(wait=False, cancel_futures=True)
+        self._art_pool.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -3,15 +3,27 @@ Spotify client helper with resilient fetch and retries.
 """
 from __future__ import annotations
 from typing import Optional, Dict, Any
-from .utils import logger, DEFAULTS, is_transient_network_error
+from pathlib import Path
+import json
+from .utils import logger, DEFAULTS, is_transient_network_error, ensure_dir, write_json_atomic
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import time
 
+# Only the track fields the UI / downloader read (see SpotloadApp._populate_tracks_task)
+PLAYLIST_ITEM_FIELDS = "items(track(id,uri,name,duration_ms,artists(name),album(name,images,release_date))),total,next"
+PLAYLIST_PAGE_SIZE = 100
+# playlist listings have no snapshot id of their own; trust the cached copy this long
+PLAYLISTS_CACHE_TTL = 15 * 60
+
 class SpotifyClient:
     def __init__(self, cfg: Dict):
         self.cfg = cfg
         self.sp: Optional[spotipy.Spotify] = None
+        # responses cached on disk: playlist items by (playlist_id, snapshot_id),
+        # the user's playlist listing by user id with a short TTL
+        self._cache_dir = Path(cfg.get("cache_dir", DEFAULTS["cache_dir"])).expanduser()
+        self._user_id: Optional[str] = None
 
     def ensure_client(self) -> bool:
         """Initialize spotipy.Spotify client from cfg. Returns True if created."""
@@ -33,28 +45,34 @@ class SpotifyClient:
             self.sp = None
             return False
 
+    def _read_cache(self, name: str) -> Optional[Any]:
+        try:
+            with open(self._cache_dir / name, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, name: str, data: Any):
+        try:
+            ensure_dir(self._cache_dir)
+            write_json_atomic(self._cache_dir / name, data)
+        except Exception as e:
+            logger.debug("Failed to write cache %s: %s", name, e)
+
     def fetch_user_playlists(self, limit: int = 50, max_retries: int = 4) -> list[Dict[str, Any]]:
         """Return list of playlist objects (may be empty). Raises on unrecoverable error."""
         if self.sp is None and not self.ensure_client():
             raise RuntimeError("Spotify client not available (configure credentials)")
 
-        attempt = 0
-        results = None
-        while attempt < max_retries:
-            try:
-                results = self.sp.current_user_playlists(limit=limit)
-                break
-            except Exception as e:
-                logger.warning("Error fetching playlists (attempt %d/%d): %s", attempt + 1, max_retries, e)
-                if is_transient_network_error(e) and attempt + 1 < max_retries:
-                    backoff = 1 + 2 ** attempt
-                    time.sleep(backoff)
-                    self.ensure_client()
-                    attempt += 1
-                    continue
-                raise
-        if results is None:
-            raise RuntimeError("Failed to fetch playlists after retries")
+        if self._user_id is None:
+            me = self._with_retries(lambda: self.sp.current_user(), "current user", max_retries)
+            self._user_id = me.get("id") or ""
+        cache_name = f"playlists_{self._user_id}.json"
+        cached = self._read_cache(cache_name)
+        if cached and time.time() - cached.get("fetched_at", 0) < PLAYLISTS_CACHE_TTL:
+            return cached.get("items", [])
+
+        results = self._with_retries(lambda: self.sp.current_user_playlists(limit=limit), "playlists", max_retries)
 
         # Accumulate pages
         playlists = []
@@ -64,38 +82,66 @@ class SpotifyClient:
                 results = self.sp.next(results)
             else:
                 break
+        self._write_cache(cache_name, {"fetched_at": time.time(), "items": playlists})
         return playlists
 
-    def fetch_playlist_items(self, playlist_id: str, max_retries: int = 4) -> list[Dict]:
-        """Return track metadata dicts for a playlist with retries. Each entry is Spotify track object."""
-        if self.sp is None and not self.ensure_client():
-            raise RuntimeError("Spotify client not available (configure credentials)")
-
+    def _with_retries(self, call, what: str, max_retries: int):
+        """Run `call()` retrying transient network errors with exponential backoff."""
         attempt = 0
-        results = None
         while attempt < max_retries:
             try:
-                results = self.sp.playlist_items(playlist_id, fields="items.track,next", additional_types=["track"])
-                break
+                return call()
             except Exception as e:
-                logger.warning("Error fetching playlist items (attempt %d/%d): %s", attempt + 1, max_retries, e)
+                logger.warning("Error fetching %s (attempt %d/%d): %s", what, attempt + 1, max_retries, e)
                 if is_transient_network_error(e) and attempt + 1 < max_retries:
                     time.sleep(1 + 2 ** attempt)
                     self.ensure_client()
                     attempt += 1
                     continue
                 raise
-        if results is None:
-            raise RuntimeError("Failed to fetch playlist items after retries")
+        raise RuntimeError(f"Failed to fetch {what} after retries")
+
+    def fetch_playlist_items(self, playlist_id: str, snapshot_id: Optional[str] = None, max_retries: int = 4) -> list[Dict]:
+        """
+        Return track metadata dicts for a playlist with retries. Each entry is Spotify track object.
+        Results are cached on disk per `snapshot_id` (looked up when not given by the caller).
+        """
+        if self.sp is None and not self.ensure_client():
+            raise RuntimeError("Spotify client not available (configure credentials)")
 
+        if not snapshot_id:
+            meta = self._with_retries(lambda: self.sp.playlist(playlist_id, fields="snapshot_id"),
+                                      "playlist snapshot", max_retries)
+            snapshot_id = meta.get("snapshot_id")
+        cache_name = f"{playlist_id}_{snapshot_id}.json" if snapshot_id else None
+        if cache_name:
+            cached = self._read_cache(cache_name)
+            if cached is not None:
+                return cached
+
+        # sp.next() drops the fields mask, so page by offset to keep every response slim
         tracks = []
-        while results:
-            for it in results.get("items", []):
+        offset = 0
+        while True:
+            page = self._with_retries(
+                lambda: self.sp.playlist_items(playlist_id, fields=PLAYLIST_ITEM_FIELDS,
+                                               additional_types=["track"],
+                                               limit=PLAYLIST_PAGE_SIZE, offset=offset),
+                "playlist items", max_retries)
+            for it in page.get("items", []) or []:
                 t = it.get("track")
                 if t:
                     tracks.append(t)
-            if results.get("next"):
-                results = self.sp.next(results)
-            else:
+            if not page.get("next"):
                 break
-        return tracks
\ No newline at end of file
+            offset += PLAYLIST_PAGE_SIZE
+        if cache_name:
+            # older snapshots of this playlist are never read again
+            for stale in self._cache_dir.glob(f"{playlist_id}_*.json"):
+                if stale.name != cache_name:
+                    try:
+                        stale.unlink()
+                    except OSError:
+                        pass
+            self._write_cache(cache_name, tracks)
+        return tracks
@@ -4,50 +4,137 @@ ID3 tagging utilities using mutagen.
 from __future__ import annotations
 from pathlib import Path
 from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from .utils import logger
 
 # Try import mutagen
 try:
-    from mutagen.mp3 import MP3
     from mutagen.id3 import ID3, TIT2, TPE1, TALB, TDRC, APIC
     MUTAGEN_AVAILABLE = True
 except Exception:
     MUTAGEN_AVAILABLE = False
 
-def tag_mp3_file(path: Path, meta: Dict, album_art_url: Optional[str] = None):
-    """Add ID3 tags to MP3 file. No-op if mutagen not installed or file missing."""
-    if not MUTAGEN_AVAILABLE or not path.exists():
+# One pooled session for album art: keeps TLS connections to the Spotify CDN alive
+_ART_SESSION = requests.Session()
+_ART_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+class _ArtCache:
+    """Small thread-safe LRU of album art bytes, bounded by total size."""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._data.get(url)
+            if data is not None:
+                self._data.move_to_end(url)
+            return data
+
+    def put(self, url: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(url, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[url] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+
+_ART_CACHE = _ArtCache(max_bytes=64 * 1024 * 1024)
+
+# in-flight prefetches started by prefetch_album_art, keyed by URL
+_ART_PENDING: Dict[str, "Future[Optional[bytes]]"] = {}
+_ART_PENDING_LOCK = threading.Lock()
+
+def _fetch_art(url: str) -> Optional[bytes]:
+    resp = _ART_SESSION.get(url, timeout=10)
+    if resp.status_code != 200:
+        return None
+    _ART_CACHE.put(url, resp.content)
+    return resp.content
+
+def _prefetch_done(url: str, _fut: Future):
+    with _ART_PENDING_LOCK:
+        _ART_PENDING.pop(url, None)
+
+def prefetch_album_art(url: Optional[str], executor: Executor):
+    """Start downloading `url` on `executor` so tagging later finds the art cached."""
+    if not url or _ART_CACHE.get(url) is not None:
         return
+    with _ART_PENDING_LOCK:
+        if url in _ART_PENDING:
+            return
+        fut = executor.submit(_fetch_art, url)
+        _ART_PENDING[url] = fut
+    fut.add_done_callback(lambda f: _prefetch_done(url, f))
+
+def _get_album_art(url: str) -> Optional[bytes]:
+    """Return cover bytes for `url`: cache, then a pending prefetch, then a direct fetch."""
+    data = _ART_CACHE.get(url)
+    if data is not None:
+        return data
+    with _ART_PENDING_LOCK:
+        fut = _ART_PENDING.get(url)
+    if fut is not None:
+        try:
+            return fut.result(timeout=5)
+        except Exception:
+            logger.debug("Album art prefetch failed or timed out: %s", url)
+    data = _ART_CACHE.get(url)
+    if data is not None:
+        return data
+    return _fetch_art(url)
+
+def tag_mp3_file(path: Path, meta: Dict, album_art_url: Optional[str] = None) -> bool:
+    """
+    Add ID3 tags to MP3 file. No-op if mutagen not installed or file missing.
+    Returns False only when tagging was attempted and failed.
+    """
+    if not MUTAGEN_AVAILABLE or not path.exists():
+        return True
 
     try:
-        audio = MP3(path, ID3=ID3)
-        audio.tags = ID3()
-
-        if meta.get("title"):
-            audio.tags.add(TIT2(encoding=3, text=meta["title"]))
-        if meta.get("artists"):
-            audio.tags.add(TPE1(encoding=3, text=", ".join(meta["artists"])))
-        if meta.get("album"):
-            audio.tags.add(TALB(encoding=3, text=meta["album"]))
-        if meta.get("year"):
-            audio.tags.add(TDRC(encoding=3, text=str(meta["year"])))
+        # build the tag standalone and write it straight to the file; going through
+        # MP3(path) would also parse the MPEG frame headers, which we never read
+        tags = ID3()
+        frames = [
+            TIT2(encoding=3, text=meta["title"]) if meta.get("title") else None,
+            TPE1(encoding=3, text=", ".join(meta["artists"])) if meta.get("artists") else None,
+            TALB(encoding=3, text=meta["album"]) if meta.get("album") else None,
+            TDRC(encoding=3, text=str(meta["year"])) if meta.get("year") else None,
+        ]
+        for frame in frames:
+            if frame is not None:
+                tags.add(frame)
 
         if album_art_url:
             try:
-                resp = requests.get(album_art_url, timeout=10)
-                if resp.status_code == 200:
-                    audio.tags.add(APIC(
+                art = _get_album_art(album_art_url)
+                if art:
+                    tags.add(APIC(
                         encoding=3,
                         mime='image/jpeg',
                         type=3,
                         desc='Cover',
-                        data=resp.content
+                        data=art
                     ))
             except Exception:
                 logger.debug("Failed to download album art for tagging")
 
-        audio.save()
+        tags.update_to_v23()
+        tags.save(str(path), v2_version=3, padding=lambda info: 0)
         logger.info(f"Tagged: {path.name}")
+        return True
     except Exception as e:
-        logger.error(f"Failed to tag MP3: {e}")
\ No newline at end of file
+        logger.error(f"Failed to tag MP3: {e}")
+        return False
@@ -13,7 +13,10 @@ Updates:
 from __future__ import annotations
 import threading
 import queue
-import time
+import concurrent.futures
+import hashlib
+import os
+from collections import OrderedDict
 from typing import Optional, Callable, Any
 from pathlib import Path
 from io import BytesIO
@@ -21,6 +24,9 @@ from io import BytesIO
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from .app_state import AppState, TrackInfo
 from .modal_manager import ModalManager
 from .download_controller import DownloadController
@@ -32,9 +38,18 @@ except Exception:
     ctk = None
 
 from PIL import Image, ImageTk
-from .utils import logger, load_config, save_config, load_history, save_history, sanitize_filename
+from .utils import logger, load_config, save_config, load_history, append_history_entry, sanitize_filename, now_strings, ensure_dir, DEFAULTS
 from .spotClient import SpotifyClient
-from .downloader import Downloader
+from .downloader import Downloader, EVENT_NAMES, EV_PROGRESS
+
+# events handled per poll tick; the rest wait for the next (busy) tick
+POLL_MAX_EVENTS = 64
+# Image.Resampling only exists on Pillow >= 9.1
+_LANCZOS = getattr(Image, "Resampling", Image).LANCZOS
+# background jobs shorter than this never show the loading modal
+LOADING_DELAY_MS = 150
+# decoded covers kept in memory; older ones are reloaded from the thumbs dir
+ALBUM_ART_CACHE_SIZE = 128
 
 class SpotloadApp(ctk.CTk if ctk else tk.Tk):
     def __init__(self):
@@ -49,10 +64,26 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
 
         self.playlists = []
         self.current_playlist = None
-        self.track_items = {}
-
-        self.album_art_cache = {}
+        # parsed track metadata per playlist id; cleared whenever the playlist list is reloaded
+        self._tracks_cache: dict[str, list] = {}
+        self._select_debounce_handle = None
+        # loaded playlist rows in display order: {"meta": ..., "state": ...}
+        self.track_items: list[dict] = []
+        # TrackItemWidget per AppState track id
+        self.track_widgets = {}
+
+        self.album_art_cache: "OrderedDict[str, Any]" = OrderedDict()  # LRU, see _remember_album_art
         self.album_art_img = None
+        self._thumbs_dir = Path(self.cfg.get("thumbs_dir", DEFAULTS["thumbs_dir"])).expanduser()
+        ensure_dir(self._thumbs_dir)
+        # pooled keep-alive connections to the Spotify image CDN for cover fetches
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+        # covers are fetched/decoded on this pool and wrapped for Tk on the UI thread
+        # (only the displayed cover is fetched, so two workers are plenty)
+        self._art_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="art")
+        self._art_inflight = set()
+        self._art_wanted: Optional[str] = None
 
         self.quality_var = tk.StringVar(value=self.cfg.get("audio_quality", "320"))
         self.metadata_var = tk.BooleanVar(value=self.cfg.get("add_metadata", True))
@@ -67,18 +98,29 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         self.downloader = Downloader(self.cfg, self.event_queue)
 
         # UI progress state
-        self.track_items = {}
-        
         self._dl_total = 0
         self._dl_done = 0
         self._download_progress_top: Optional[tk.Toplevel] = None
+        self._progress_set: Optional[Callable[[float], None]] = None
         self._loading_top: Optional[tk.Toplevel] = None
         self._loading_anim_handle = None
         self._loading_dots = 0
         self._loading_message_base = ""
 
         self._build_ui()
-        self.after(200, self._poll_event_queue)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.state.schedule_tracks_flush(self)
+        self.after(int(self.cfg.get("poll_idle_ms", 200)), self._poll_event_queue)
+
+    def _on_close(self):
+        # worker pools are not daemonic; drop their queued jobs so exit is not held up
+        try:
+            self.dl_controller.shutdown()
+        except Exception:
+            logger.exception("Failed to stop download controller")
+        self.downloader.stop(join=False)
+        self._art_pool.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
 
     # ---------------- UI construction -----------------
     def _build_ui(self):
@@ -125,10 +167,10 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
             for tid, t in self.state.tracks.items():
                 tw = TrackItemWidget(self.track_frame_container, t)
                 tw.pack(fill="x", pady=2)
-                self.track_items[tid] = tw
+                self.track_widgets[tid] = tw
         # subscribe to state changes so UI refreshes on updates
         self.state.subscribe_tracks(lambda: self.after(0, refresh_tracks))
-        self.state.subscribe_track_updated(lambda tid: self.after(0, self.track_items.get(tid).refresh(self.state.tracks[tid]) if self.track_items.get(tid) else None))
+        self.state.subscribe_track_updated(lambda tid: self.after(0, self.track_widgets.get(tid).refresh(self.state.tracks[tid]) if self.track_widgets.get(tid) else None))
 
         self.album_art_label = ctk.CTkLabel(right, text="No cover", width=250, height=250)
         self.album_art_label.pack(padx=6, pady=6)
@@ -159,7 +201,8 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         tk.Button(frame, text="Load Playlists", command=lambda: self.run_in_background(self._load_playlists_task, message="Loading playlists...")).pack()
         tk.Button(frame, text="Download Playlist (Audio)", command=self.download_playlist_audio).pack()
         tk.Button(frame, text="Export M3U", command=self._export_playlist_m3u).pack()
-        self.track_listbox = tk.Listbox(frame)
+        # Treeview only lays out the visible rows, so long playlists scroll and fill quickly
+        self.track_listbox = ttk.Treeview(frame, show="tree", height=20)
         self.track_listbox.pack(fill="both", expand=True)
         self.album_art_label = tk.Label(frame, text="No cover")
         self.album_art_label.pack()
@@ -181,7 +224,17 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         If the function returns a result and `on_done` is provided, `on_done(result)` is
         called in the main thread. Exceptions are logged and optionally shown to the user.
         """
-        self.show_loading(message)
+        # only show the modal if the job is still running after LOADING_DELAY_MS
+        loading = {"shown": False}
+        def show():
+            loading["shown"] = True
+            self.show_loading(message)
+        show_handle = self.after(LOADING_DELAY_MS, show)
+        def finish():
+            if loading["shown"]:
+                self.hide_loading()
+            else:
+                self.after_cancel(show_handle)
         def worker():
             try:
                 res = func(*args, **(kwargs or {}))
@@ -191,10 +244,10 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
                 logger.exception("Background task failed: %s", e)
                 if show_error:
                     # Show the error in the UI thread
-                    self.after(0, lambda: messagebox.showerror("Error", str(e)))
+                    self.after(0, lambda msg=str(e): messagebox.showerror("Error", msg))
             finally:
-                # always hide loading in UI thread
-                self.after(0, self.hide_loading)
+                # always hide (or cancel) loading in UI thread
+                self.after(0, finish)
         threading.Thread(target=worker, daemon=True).start()
 
     # ---------------- Config & spotify -----------------
@@ -204,6 +257,8 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         self.cfg["organize_by_artist"] = self.organize_var.get()
         self.cfg["skip_existing"] = self.skip_existing_var.get()
         save_config(self.cfg)
+        self.dl_controller.reload_config()
+        self.downloader.reload_config()
         self.log("Settings saved")
 
     def connect_spotify(self):
@@ -220,27 +275,40 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
     def _load_playlists_task(self):
         playlists = self.sp_client.fetch_user_playlists()
         self.playlists = playlists
+        # snapshots may have moved on; refetch tracks on next visit
+        self._tracks_cache = {}
         # update UI after fetch
         self.after(0, lambda: self._update_playlist_ui(len(playlists)))
 
     def _update_playlist_ui(self, count: int):
         self.playlist_listbox.delete(0, "end")
-        for p in self.playlists:
-            display = f"{p.get('name')} ({p.get('tracks', {}).get('total', 0)})"
-            self.playlist_listbox.insert("end", display)
+        # one Tcl call for all rows (Listbox.insert takes varargs)
+        lines = [f"{p.get('name')} ({p.get('tracks', {}).get('total', 0)})" for p in self.playlists]
+        self.playlist_listbox.insert("end", *lines)
         self.log(f"Loaded {count} playlists")
 
     def _on_playlist_select(self):
+        # debounce: holding an arrow key should not start a fetch per row passed
+        if self._select_debounce_handle:
+            self.after_cancel(self._select_debounce_handle)
+        self._select_debounce_handle = self.after(250, self._do_playlist_select)
+
+    def _do_playlist_select(self):
+        self._select_debounce_handle = None
         sel = self.playlist_listbox.curselection()
         if not sel:
             return
         idx = sel[0]
         self.current_playlist = self.playlists[idx]
+        cached = self._tracks_cache.get(self.current_playlist.get("id"))
+        if cached is not None:
+            self._apply_track_items(*self._build_track_rows(cached))
+            return
         # fetch tracks via run_in_background so errors are shown and loading displayed
         self.run_in_background(self._populate_tracks_task, args=(self.current_playlist,), message="Loading tracks...")
 
     def _populate_tracks_task(self, playlist):
-        tracks = self.sp_client.fetch_playlist_items(playlist.get("id"))
+        tracks = self.sp_client.fetch_playlist_items(playlist.get("id"), snapshot_id=playlist.get("snapshot_id"))
         items = []
         for t in tracks:
             album_art_url = None
@@ -258,18 +326,34 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
                 "album_art_url": album_art_url,
                 "year": year
             })
-        # update UI
-        self.track_items.clear()
-        self.after(0, lambda: self.track_listbox.delete(0, "end"))
-        for i, meta in enumerate(items):
-            self.track_items[i] = {"meta": meta, "state": "idle"}
-            display = f"{i+1}. {meta['title']} — {', '.join(meta['artists'])}"
-            self.after(0, lambda d=display: self.track_listbox.insert("end", d))
+        self._tracks_cache[playlist.get("id")] = items
+        if playlist is not self.current_playlist:
+            # the user moved on while this was loading
+            return
+        # build everything here, then hand it to the UI thread in a single callback
+        display_lines, track_items = self._build_track_rows(items)
+        self.after(0, self._apply_track_items, display_lines, track_items)
         self.log(f"Loaded {len(items)} tracks")
-        if items and items[0].get("album_art_url"):
-            self._load_and_set_album_art(items[0]["album_art_url"])
-        else:
-            self._clear_album_art()
+
+    def _build_track_rows(self, items: list):
+        track_items = []
+        display_lines = []
+        for i, meta in enumerate(items):
+            track_items.append({"meta": meta, "state": "idle"})
+            display_lines.append(f"{i+1}. {meta['title']} — {', '.join(meta['artists'])}")
+        return display_lines, track_items
+
+    def _apply_track_items(self, display_lines: list, track_items: list):
+        self.track_items = track_items
+        first_url = track_items[0]["meta"].get("album_art_url") if track_items else None
+        self._load_and_set_album_art(first_url)
+        # only the tk fallback UI has a track list widget
+        tv = getattr(self, "track_listbox", None)
+        if tv is None:
+            return
+        tv.delete(*tv.get_children())
+        for i, line in enumerate(display_lines):
+            tv.insert("", "end", iid=str(i), text=line)
 
     # ---------------- Album art handling -----------------
     def _clear_album_art(self):
@@ -282,47 +366,92 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         except Exception:
             pass
 
+    def _set_album_art(self, imgobj):
+        try:
+            self.album_art_label.configure(image=imgobj, text="")
+        except Exception:
+            try:
+                self.album_art_label.config(image=imgobj, text="")
+            except Exception:
+                pass
+        self.album_art_img = imgobj
+
     def _load_and_set_album_art(self, url: Optional[str]):
         if not url:
+            self._art_wanted = None
             self._clear_album_art()
             return
         if url in self.album_art_cache:
-            imgobj = self.album_art_cache[url]
-            try:
-                self.album_art_label.configure(image=imgobj, text="")
-            except Exception:
-                try:
-                    self.album_art_label.config(image=imgobj, text="")
-                except Exception:
-                    pass
-            self.album_art_img = imgobj
+            self._art_wanted = url
+            self.album_art_cache.move_to_end(url)
+            self._set_album_art(self.album_art_cache[url])
             return
+        self._request_thumbnail(url)
 
-        def worker():
+    def _request_thumbnail(self, url: str):
+        # UI thread only: a cover that is still loading is not fetched twice
+        self._art_wanted = url
+        if url in self._art_inflight:
+            return
+        self._art_inflight.add(url)
+        fut = self._art_pool.submit(self._fetch_thumbnail, url)
+        fut.add_done_callback(lambda f: self.after(0, self._on_thumbnail_done, url, f))
+
+    def _fetch_thumbnail(self, url: str):
+        """
+        Return a 250x250 PIL cover for `url`, from the on-disk thumbnail cache when present,
+        otherwise downloaded and stored there. Runs on the art pool; no Tk calls.
+        """
+        thumb_path = self._thumbs_dir / f"{hashlib.sha1(url.encode()).hexdigest()}.webp"
+        if thumb_path.exists():
             try:
-                import requests
-                from PIL import Image
-                r = requests.get(url, stream=True, timeout=10)
-                r.raise_for_status()
-                img = Image.open(BytesIO(r.content)).convert("RGBA")
-                img = img.resize((250, 250), Image.LANCZOS)
-                if ctk:
-                    try:
-                        ctk_img = ctk.CTkImage(light_image=img, dark_image=img, size=(250, 250))
-                        self.album_art_cache[url] = ctk_img
-                        self.after(0, lambda: self.album_art_label.configure(image=ctk_img, text=""))
-                        self.album_art_img = ctk_img
-                        return
-                    except Exception:
-                        pass
-                photo = ImageTk.PhotoImage(img)
-                self.album_art_cache[url] = photo
-                self.after(0, lambda: self.album_art_label.configure(image=photo, text=""))
-                self.album_art_img = photo
+                img = Image.open(thumb_path)
+                img.load()
+                return url, img.convert("RGBA")
             except Exception:
-                self.after(0, self._clear_album_art)
+                logger.debug("Unreadable cached thumbnail: %s", thumb_path)
+        r = self._http.get(url, timeout=10)
+        r.raise_for_status()
+        img = Image.open(BytesIO(r.content))
+        if img.format == "JPEG":
+            # let libjpeg decode at reduced scale: 640x640 covers come out as 320x320
+            # (thumbnail()'s own draft asks for 2x the target and gets scale 1 here)
+            img.draft("RGB", (250, 250))
+        img.thumbnail((250, 250), _LANCZOS, reducing_gap=2.0)
+        img = img.convert("RGBA")
+        try:
+            tmp = thumb_path.with_name(thumb_path.name + ".tmp")
+            img.save(tmp, "WEBP", quality=80, method=4)
+            os.replace(tmp, thumb_path)
+        except Exception:
+            logger.debug("Failed to cache thumbnail: %s", thumb_path)
+        return url, img
 
-        threading.Thread(target=worker, daemon=True).start()
+    def _remember_album_art(self, url: str, imgobj):
+        self.album_art_cache[url] = imgobj
+        self.album_art_cache.move_to_end(url)
+        while len(self.album_art_cache) > ALBUM_ART_CACHE_SIZE:
+            self.album_art_cache.popitem(last=False)
+
+    def _on_thumbnail_done(self, url: str, fut: "concurrent.futures.Future"):
+        self._art_inflight.discard(url)
+        try:
+            _, img = fut.result()
+        except Exception:
+            if self._art_wanted == url:
+                self._clear_album_art()
+            return
+        imgobj = None
+        if ctk:
+            try:
+                imgobj = ctk.CTkImage(light_image=img, dark_image=img, size=(250, 250))
+            except Exception:
+                imgobj = None
+        if imgobj is None:
+            imgobj = ImageTk.PhotoImage(img)
+        self._remember_album_art(url, imgobj)
+        if self._art_wanted == url:
+            self._set_album_art(imgobj)
 
     # ---------------- Loading modal and bulk download UI -------------
     def show_loading(self, message: str):
@@ -369,6 +498,14 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         except Exception:
             pass
         self._loading_dots += 1
+        # stop the timer while the modal is withdrawn/iconified instead of ticking forever
+        try:
+            visible = self._loading_top.state() == "normal"
+        except Exception:
+            visible = False
+        if not visible:
+            self._loading_anim_handle = None
+            return
         self._loading_anim_handle = self.after(400, self._animate_loading)
 
     def hide_loading(self):
@@ -426,6 +563,9 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         self._download_progress_top = top
         self._download_progress_bar = pb
         self._download_progress_label = status_lbl
+        # resolve the widget kind once; the poll loop just calls _progress_set(fraction)
+        self._progress_is_ctk = bool(ctk) and isinstance(pb, ctk.CTkProgressBar)
+        self._progress_set = pb.set if self._progress_is_ctk else (lambda v: pb.configure(value=v * self._dl_total))
         self._dl_total = total
         self._dl_done = 0
 
@@ -441,13 +581,13 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
 
     # ---------------- Download controls -----------------
     def queue_download_selected(self):
-        sel = self.track_listbox.curselection()
+        sel = self.track_listbox.selection()
         if not sel:
             messagebox.showwarning("No selection", "Select one or more tracks to download.")
             return
-        for i in sel:
-            info = self.track_items.get(i)
-            if info:
+        for i in map(int, sel):
+            if 0 <= i < len(self.track_items):
+                info = self.track_items[i]
                 task = {"idx": i, "meta": info["meta"], "total": len(self.track_items)}
                 self.downloader.enqueue(task)
                 info["state"] = "queued"
@@ -462,7 +602,7 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
             return
         total = len(self.track_items)
         self.show_download_progress(total)
-        for idx, info in list(self.track_items.items()):
+        for idx, info in enumerate(self.track_items):
             task = {"idx": idx, "meta": info["meta"], "total": total}
             self.downloader.enqueue(task)
             info["state"] = "queued"
@@ -470,38 +610,38 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
 
     # ---------------- Event polling from downloader -------------------
     def _poll_event_queue(self):
-        while not self.event_queue.empty():
-            ev = self.event_queue.get()
-            etype = ev.get("type")
-            meta = ev.get("meta", {})
+        # widget writes are collected during the drain and applied once per tick
+        drained = 0
+        log_lines = []
+        progress_dirty = False
+        while drained < POLL_MAX_EVENTS:
+            try:
+                code, _track_id, info = self.event_queue.get_nowait()
+            except queue.Empty:
+                break
+            drained += 1
+            if code == EV_PROGRESS:
+                continue
+            etype = EVENT_NAMES.get(code)
+            meta = info.get("meta", {})
             if etype == "completed":
-                path = ev.get("path")
-                self.log(f"Downloaded: {meta.get('title')} -> {path}")
-                self.history.setdefault("downloads", []).append({
+                path = info.get("path")
+                log_lines.append(f"Downloaded: {meta.get('title')} -> {path}")
+                entry = {
                     "title": meta.get("title", ""),
                     "artist": ", ".join(meta.get("artists", [])),
                     "status": "Downloaded",
-                    "date": time.strftime("%Y-%m-%dT%H:%M:%S")
-                })
-                save_history(self.history)
+                    "date": now_strings()[0]
+                }
+                self.history.setdefault("downloads", []).append(entry)
+                append_history_entry("downloads", entry)
                 if self._dl_total > 0:
                     self._dl_done += 1
-                    try:
-                        if ctk and isinstance(self._download_progress_bar, ctk.CTkProgressBar):
-                            val = min(1.0, self._dl_done / self._dl_total)
-                            self._download_progress_bar.set(val)
-                        else:
-                            self._download_progress_bar["value"] = self._dl_done
-                        self._download_progress_label.config(text=f"{self._dl_done} / {self._dl_total}")
-                    except Exception:
-                        pass
-                    if self._dl_done >= self._dl_total:
-                        self.log("Playlist download complete")
-                        self.after(200, self.hide_download_progress)
+                    progress_dirty = True
 
             elif etype == "ffmpeg_missing":
                 # critical: let the user know immediately and suggest action
-                self.log("FFmpeg missing - please install ffmpeg.")
+                log_lines.append("FFmpeg missing - please install ffmpeg.")
                 messagebox.showerror("FFmpeg missing", "FFmpeg is required to convert audio. Please install ffmpeg and ensure it's on your PATH.")
             elif etype in ("video_unavailable", "private_video", "download_error", "failed"):
                 # Informative user-visible message for individual download problems
@@ -513,9 +653,9 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
                     body = f"Track private/deleted: {meta.get('title')}"
                 else:
                     title = "Download error"
-                    body = f"Failed to download '{meta.get('title')}': {ev.get('error', 'Unknown error')}"
+                    body = f"Failed to download '{meta.get('title')}': {info.get('error') or 'Unknown error'}"
                 # Log and show a non-blocking warning to the user
-                self.log(f"{title}: {body}")
+                log_lines.append(f"{title}: {body}")
                 try:
                     messagebox.showwarning(title, body)
                 except Exception:
@@ -530,32 +670,44 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
                     "failed": "Failed"
                 }
                 status = status_map.get(etype, "Failed")
-                self.history.setdefault("failed", []).append({
+                entry = {
                     "title": meta.get("title", ""),
                     "artist": ", ".join(meta.get("artists", [])),
                     "status": status,
-                    "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
-                    "error": ev.get("error")
-                })
-                save_history(self.history)
+                    "date": now_strings()[0],
+                    "error": info.get("error")
+                }
+                self.history.setdefault("failed", []).append(entry)
+                append_history_entry("failed", entry)
 
                 # update bulk progress if active
                 if self._dl_total > 0:
                     self._dl_done += 1
-                    try:
-                        if ctk and isinstance(self._download_progress_bar, ctk.CTkProgressBar):
-                            val = min(1.0, self._dl_done / self._dl_total)
-                            self._download_progress_bar.set(val)
-                        else:
-                            self._download_progress_bar["value"] = self._dl_done
-                        self._download_progress_label.config(text=f"{self._dl_done} / {self._dl_total}")
-                    except Exception:
-                        pass
-                    if self._dl_done >= self._dl_total:
-                        self.after(200, self.hide_download_progress)
+                    progress_dirty = True
+            elif etype == "tag_failed":
+                # the file is already downloaded and counted; just note the missing tags
+                log_lines.append(f"Tagging failed: {meta.get('title')} -> {info.get('path')} ({info.get('error') or 'Unknown error'})")
             else:
-                self.log(f"Event: {ev}")
-        self.after(200, self._poll_event_queue)
+                log_lines.append(f"Event: {etype} {info}")
+
+        if progress_dirty:
+            try:
+                self._progress_set(min(1.0, self._dl_done / self._dl_total))
+                self._download_progress_label.config(text=f"{self._dl_done} / {self._dl_total}")
+            except Exception:
+                pass
+            if self._dl_done >= self._dl_total:
+                log_lines.append("Playlist download complete")
+                self.after(200, self.hide_download_progress)
+        if log_lines:
+            self._log_lines(log_lines)
+
+        # poll again soon while events are flowing, back off when idle
+        if drained:
+            delay = int(self.cfg.get("poll_busy_ms", 25))
+        else:
+            delay = int(self.cfg.get("poll_idle_ms", 200))
+        self.after(delay, self._poll_event_queue)
 
     # --------------- Export M3U ---------------
     def _export_playlist_m3u(self):
@@ -569,25 +721,33 @@ class SpotloadApp(ctk.CTk if ctk else tk.Tk):
         )
         if not filename:
             return
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write("#EXTM3U\n")
-                for info in self.track_items.values():
-                    meta = info["meta"]
-                    artist = ", ".join(meta.get("artists", []))
-                    title = meta.get("title", "Unknown")
-                    duration = int(meta.get("duration_ms", 0) / 1000)
-                    f.write(f"#EXTINF:{duration},{artist} - {title}\n")
-                    f.write(f"{sanitize_filename(f'{artist} - {title}')}.mp3\n")
-            messagebox.showinfo("Exported", f"Playlist exported to:\n{filename}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        metas = [info["meta"] for info in self.track_items]
+
+        def build_and_write():
+            # build the whole playlist in memory and write it with a single call
+            lines = ["#EXTM3U\n"]
+            for meta in metas:
+                artist = ", ".join(meta.get("artists", []))
+                title = meta.get("title", "Unknown")
+                duration = int(meta.get("duration_ms", 0)) // 1000
+                name = f"{artist} - {title}"
+                lines.append(f"#EXTINF:{duration},{name}\n{sanitize_filename(name)}.mp3\n")
+            Path(filename).write_text("".join(lines), encoding="utf-8")
+            return filename
+
+        self.run_in_background(build_and_write, message="Exporting playlist...",
+                               on_done=lambda fn: messagebox.showinfo("Exported", f"Playlist exported to:\n{fn}"))
 
     # ---------------- Logging -----------------
     def log(self, msg: str):
-        ts = time.strftime("%H:%M:%S")
+        self._log_lines([msg])
+
+    def _log_lines(self, msgs: list):
+        """Append several messages to the log widget with a single insert."""
+        ts = now_strings()[1]
         try:
-            self.log_text.insert("end", f"[{ts}] {msg}\n")
+            self.log_text.insert("end", "".join(f"[{ts}] {m}\n" for m in msgs))
             self.log_text.see("end")
         except Exception:
-            logger.info(msg)
\ No newline at end of file
+            for m in msgs:
+                logger.info(m)
\ No newline at end of file
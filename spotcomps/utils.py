@@ -2,10 +2,13 @@
 Utilities: config, history, helpers and logging setup.
 """
 from __future__ import annotations
+import functools
 import json
 import logging
+import os
 import re
-import socket
+import time
+from collections import deque
 from pathlib import Path
 from typing import Dict
 
@@ -13,33 +16,64 @@ from typing import Dict
 APP_DIR = Path.home() / ".spotload"
 APP_DIR.mkdir(parents=True, exist_ok=True)
 CONFIG_FILE = APP_DIR / "config.json"
-HISTORY_FILE = APP_DIR / "download_history.json"
+# append-only, one {"kind": "downloads" | "failed", ...} object per line
+HISTORY_FILE = APP_DIR / "download_history.jsonl"
+LEGACY_HISTORY_FILE = APP_DIR / "download_history.json"
+HISTORY_LIMIT = 1000
 
 DEFAULTS = {
     "output_dir": str(Path.home() / "Music" / "SpotifyMusic"),
     "concurrency": 3,
     "cache_path": str(APP_DIR / ".spotify_cache"),
+    "cache_dir": str(APP_DIR / "cache"),
+    "thumbs_dir": str(APP_DIR / "thumbs"),
     "client_id": "",
     "client_secret": "",
     "redirect_uri": "http://127.0.0.1:8888/callback",
     "audio_quality": "320",
     "add_metadata": True,
     "organize_by_artist": False,
-    "skip_existing": True
+    "skip_existing": True,
+    # yt-dlp download retries per track (yt-dlp's own default)
+    "ytdlp_retries": 10,
+    # UI event-queue polling: fast while downloads report events, slow when idle
+    "poll_busy_ms": 25,
+    "poll_idle_ms": 200
 }
 
-_illegal_filename_re = re.compile(r'[\\/*?:"<>|]')
+# characters not allowed in file names, deleted via str.translate
+_ILLEGAL_TABLE = str.maketrans("", "", '\\/*?:"<>|')
 
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(name: str) -> str:
     if not name:
         return ""
-    name = name.strip()
-    name = _illegal_filename_re.sub("", name)
-    return name[:240]
+    return name.strip().translate(_ILLEGAL_TABLE)[:240]
+
+# (epoch second, ISO timestamp, HH:MM:SS) for the last second formatted; swapped as one tuple
+_ts_cache = (0, "", "")
+
+def now_strings() -> tuple:
+    """Return (ISO timestamp, HH:MM:SS) for now, formatting at most once per second."""
+    global _ts_cache
+    sec = int(time.time())
+    cached = _ts_cache
+    if cached[0] != sec:
+        t = time.localtime(sec)
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", t), time.strftime("%H:%M:%S", t))
+        _ts_cache = cached
+    return cached[1], cached[2]
 
 def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
 
+def write_json_atomic(path: Path, data):
+    """Write `data` as JSON to a temp file next to `path`, then rename it into place."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
 # Config / history helpers
 def load_config() -> Dict:
     try:
@@ -56,27 +90,64 @@ def load_config() -> Dict:
         return DEFAULTS.copy()
 
 def save_config(cfg: Dict):
+    # atomic: a crash mid-write must not leave a truncated config (load_config would reset it)
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
+        write_json_atomic(CONFIG_FILE, cfg)
     except Exception:
         pass
 
 def load_history() -> Dict:
-    if HISTORY_FILE.exists():
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {"downloads": [], "failed": []}
-    return {"downloads": [], "failed": []}
+    """Load the last HISTORY_LIMIT history entries, compacting the file if it has grown well past that."""
+    history = {"downloads": [], "failed": []}
+    if not HISTORY_FILE.exists():
+        if LEGACY_HISTORY_FILE.exists():
+            try:
+                with open(LEGACY_HISTORY_FILE, "r", encoding="utf-8") as f:
+                    history.update(json.load(f))
+            except Exception:
+                return history
+            # migrate once, so the first append does not hide the legacy entries;
+            # the old file is left in place as a backup
+            save_history(history)
+        return history
+    try:
+        line_count = 0
+        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+            tail = deque(maxlen=HISTORY_LIMIT)
+            for line in f:
+                line_count += 1
+                tail.append(line)
+        for line in tail:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            history.setdefault(entry.pop("kind", "downloads"), []).append(entry)
+        if line_count > 2 * HISTORY_LIMIT:
+            save_history(history)
+    except Exception:
+        pass
+    return history
+
+def append_history_entry(kind: str, entry: Dict):
+    """Append one history entry ("downloads" or "failed") without rewriting the file."""
+    try:
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"kind": kind, **entry}) + "\n")
+    except Exception:
+        pass
 
 def save_history(history: Dict):
+    """Rewrite the whole history file (used for compaction)."""
     try:
-        if len(history.get("downloads", [])) > 1000:
-            history["downloads"] = history["downloads"][-1000:]
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(history, f, indent=2)
+        if len(history.get("downloads", [])) > HISTORY_LIMIT:
+            history["downloads"] = history["downloads"][-HISTORY_LIMIT:]
+        lines = [json.dumps({"kind": kind, **entry}) + "\n"
+                 for kind, entries in history.items() for entry in entries]
+        tmp = HISTORY_FILE.with_name(HISTORY_FILE.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join(lines))
+        os.replace(tmp, HISTORY_FILE)
     except Exception:
         pass
 
@@ -89,21 +160,14 @@ if not logger.handlers:
 logger.setLevel(logging.INFO)
 
 # Transient network error detection helper
-def is_transient_network_error(exc: Exception) -> bool:
+try:
     import requests
-    try:
-        import urllib3
-        URLLIB3_AVAILABLE = True
-    except Exception:
-        URLLIB3_AVAILABLE = False
-
-    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
-        return True
-    if URLLIB3_AVAILABLE and isinstance(exc, urllib3.exceptions.ProtocolError):
-        return True
-    if isinstance(exc, (ConnectionResetError, BrokenPipeError, socket.error, OSError)):
-        return True
-    msg = str(exc).lower()
-    if "connection reset" in msg or "connection aborted" in msg or "timeout" in msg:
-        return True
-    return False
\ No newline at end of file
+    import urllib3
+    _TRANSIENT_TYPES = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        urllib3.exceptions.ProtocolError, ConnectionResetError, BrokenPipeError, OSError)
+except Exception:
+    _TRANSIENT_TYPES = (ConnectionResetError, BrokenPipeError, OSError)
+_TRANSIENT_RE = re.compile(r"connection reset|connection aborted|timeout", re.IGNORECASE)
+
+def is_transient_network_error(exc: Exception) -> bool:
+    return isinstance(exc, _TRANSIENT_TYPES) or bool(_TRANSIENT_RE.search(str(exc)))
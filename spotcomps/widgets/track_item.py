@@ -15,14 +15,32 @@ STATUS_COLORS = {
     "failed": "#dc3545",
 }
 
+def _status_style(status: str) -> str:
+    return f"Status.{status.capitalize()}.TLabel"
+
 class TrackItemWidget(ttk.Frame):
+    _styles_ready = False
+
+    @classmethod
+    def _ensure_styles(cls):
+        """Register one ttk label style per status colour (once per process)."""
+        if cls._styles_ready:
+            return
+        s = ttk.Style()
+        for key, col in STATUS_COLORS.items():
+            s.configure(_status_style(key), foreground=col)
+        cls._styles_ready = True
+
     def __init__(self, parent, track: TrackInfo, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
+        self._ensure_styles()
         self.track = track
+        self._last_status: Optional[str] = None
+        self._last_pct: Optional[int] = None
         self.columnconfigure(0, weight=1)
         self.title_lbl = ttk.Label(self, text=f"{track.title} — {track.artist}")
         self.title_lbl.grid(row=0, column=0, sticky="w")
-        self.status_lbl = ttk.Label(self, text=track.status.capitalize(), width=10, anchor="center")
+        self.status_lbl = ttk.Label(self, width=10, anchor="center")
         self.status_lbl.grid(row=0, column=1, padx=(8,0))
         self.progress = ttk.Progressbar(self, orient="horizontal", length=140, mode="determinate")
         self.progress.grid(row=1, column=0, columnspan=2, sticky="we", pady=(4,0))
@@ -31,12 +49,16 @@ class TrackItemWidget(ttk.Frame):
     def refresh(self, track: Optional[TrackInfo] = None):
         if track:
             self.track = track
-        # status badge
+        # status badge: only touch Tk when the status actually changed
         status = (self.track.status or "idle")
-        color = STATUS_COLORS.get(status, "#9aa0a6")
-        # note: ttk Label styling per-platform is limited; use style or fallback to background color via tk.Label if needed.
-        self.status_lbl.config(text=status.capitalize())
+        if status != self._last_status:
+            style = _status_style(status) if status in STATUS_COLORS else _status_style("idle")
+            self.status_lbl.configure(text=status.capitalize(), style=style)
+            self._last_status = status
         try:
-            self.progress['value'] = int(self.track.progress * 100)
+            pct = int(self.track.progress * 100)
         except Exception:
-            self.progress['value'] = 0
\ No newline at end of file
+            pct = 0
+        if pct != self._last_pct:
+            self.progress['value'] = pct
+            self._last_pct = pct